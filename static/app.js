@@ -0,0 +1,650 @@
+const tg = window.Telegram?.WebApp;
+let tgUserId = null;
+let username = null;
+// query strings that only depend on the Telegram user; built once in init()
+let profileQs = '';
+let adminQs = '';
+// in-memory copy of localStorage 'role', so tab switches only touch storage on change
+let storedRole = null;
+
+let selectedDates = [];
+let assistantLoaded = null;
+let employerLoaded = null;
+// what the dashboard summaries currently show, to skip identical rebuilds
+let assistantRendered = null;
+let employerRendered = null;
+let adminData = null;
+let adminKind = null;
+
+// the page is static (app.js is deferred, templates carry no ids), so look each element up once
+const byIdCache = {};
+function byId(id){
+  return byIdCache[id] || (byIdCache[id] = document.getElementById(id));
+}
+
+// profile field -> [form input id, value when the profile has none]
+const ASSISTANT_FIELDS = {
+  name: ['a_name', ''], city: ['a_city', ''], phone: ['a_phone', ''],
+  exp: ['a_exp', '0'], rate: ['a_rate', ''], about: ['a_about', '']
+};
+const EMPLOYER_FIELDS = {
+  clinic: ['e_clinic', ''], city: ['e_city', ''], phone: ['e_phone', ''], about: ['e_about', '']
+};
+
+function fillForm(fields, data){
+  for (const k in fields) byId(fields[k][0]).value = data[k] || fields[k][1];
+}
+
+function readForm(fields){
+  const out = {};
+  for (const k in fields) out[k] = byId(fields[k][0]).value.trim();
+  return out;
+}
+
+const tplAssistantItem = byId('tplAssistantItem').content.firstElementChild;
+const tplAdminItem = byId('tplAdminItem').content.firstElementChild;
+
+function el(tag, cls, text){
+  const n = document.createElement(tag);
+  if (cls) n.className = cls;
+  if (text != null) n.textContent = text;
+  return n;
+}
+
+// lines: arrays of strings/nodes, separated by <br>; strings become text nodes
+function setLines(box, lines){
+  box.textContent = '';
+  lines.forEach((parts, i) => {
+    if (i) box.appendChild(el('br'));
+    box.append(...parts);
+  });
+}
+
+// flat urlencoded body for the save endpoints; arrays become repeated keys, nulls are dropped
+function formBody(payload){
+  const body = new URLSearchParams();
+  for (const [k, v] of Object.entries(payload)){
+    if (v == null) continue;
+    if (Array.isArray(v)) v.forEach(x => body.append(k, x));
+    else body.append(k, String(v));
+  }
+  return body;
+}
+
+function debounce(fn, ms){
+  let t;
+  return (...args) => {
+    clearTimeout(t);
+    t = setTimeout(() => fn(...args), ms);
+  };
+}
+
+function sameFields(a, b, keys){
+  return !!a && !!b && keys.every(k => String(a[k]) === String(b[k]));
+}
+
+// FastAPI sends a string detail for HTTPException and a list of errors for 422
+function errText(data, fallback){
+  const d = data && data.detail;
+  if (Array.isArray(d)) return (d[0] && d[0].msg) || fallback;
+  return d || fallback;
+}
+
+function showNote(id, msg){
+  const el = byId(id);
+  if (!el) return;
+  el.innerText = msg;
+  el.style.display = 'block';
+  setTimeout(()=> el.style.display = 'none', 2200);
+}
+
+function hideAll(){
+  byId('roleChoice').style.display='none';
+  byId('assistantDash').style.display='none';
+  byId('assistantForm').style.display='none';
+  byId('employerDash').style.display='none';
+  byId('employerForm').style.display='none';
+  byId('adminPanel').style.display='none';
+}
+
+function setTabs(role){
+  byId('tabAssistant').classList.toggle('tabActive', role==='assistant');
+  byId('tabEmployer').classList.toggle('tabActive', role==='employer');
+  byId('tabAdmin').classList.toggle('tabActive', role==='admin');
+}
+
+// one bridge call per change; the previous click handler is detached so tab switches
+// don't stack saveAssistant and searchAssistants on the same button
+let mainButtonHandler = null;
+function setMainButton(text, handler){
+  if (!tg) return;
+  if (mainButtonHandler) tg.MainButton.offClick(mainButtonHandler);
+  mainButtonHandler = handler;
+  if (!handler){
+    tg.MainButton.hide();
+    return;
+  }
+  tg.MainButton.onClick(handler);
+  tg.MainButton.setParams({text, is_visible: true});
+}
+
+function goRoleChoice(){
+  if (storedRole !== null){ localStorage.removeItem('role'); storedRole = null; }
+  hideAll();
+  setTabs('');
+  byId('tabs').style.display = 'none';
+  byId('roleChoice').style.display = 'block';
+  setMainButton();
+}
+
+function setRole(role){
+  if (role !== storedRole){ localStorage.setItem('role', role); storedRole = role; }
+  byId('tabs').style.display = 'flex';
+  setTabs(role);
+  hideAll();
+
+  if (role==='assistant'){
+    setMainButton("Сохранить", saveAssistant);
+    loadAssistant(true);
+    return;
+  }
+  if (role==='employer'){
+    setMainButton("Найти", searchAssistants);
+    loadEmployer(true);
+    return;
+  }
+  if (role==='admin'){
+    setMainButton();
+    byId('adminPanel').style.display='block';
+    adminLoadAll();
+    return;
+  }
+}
+
+// -------- Dates UI (assistant) --------
+function renderDates(){
+  const box = byId('a_dates_view');
+  if (!selectedDates.length){
+    box.textContent = 'Пока не выбрано';
+    return;
+  }
+  box.textContent = '';
+  for (const d of selectedDates){
+    const pill = el('span', 'miniPill', d);
+    const rm = el('a', null, '✕');
+    rm.href = '#';
+    rm.addEventListener('click', ev => { ev.preventDefault(); removeDate(d); });
+    pill.appendChild(rm);
+    box.appendChild(pill);
+  }
+}
+
+function addDate(){
+  const inp = byId('a_date');
+  const d = inp.value;
+  if (!d) return;
+  if (!selectedDates.includes(d)) selectedDates.push(d);
+  selectedDates.sort();
+  inp.value = '';
+  renderDates();
+}
+
+function removeDate(d){
+  selectedDates = selectedDates.filter(x => x !== d);
+  renderDates();
+}
+
+// -------- Assistant --------
+function openAssistantForm(){
+  hideAll();
+  byId('assistantForm').style.display='block';
+}
+
+function showAssistantDash(a){
+  assistantLoaded = a;
+  hideAll();
+  byId('assistantDash').style.display='block';
+
+  if (sameFields(assistantRendered, a, ['name', 'city', 'phone', 'exp', 'rate', 'rating', 'availability_dates'])) return;
+  assistantRendered = a;
+
+  setLines(byId('assistantSummary'), [
+    [el('b', null, a.name), ` • ${a.city}`],
+    [`Телефон: ${a.phone}`],
+    [`Опыт: ${a.exp} • Ставка: ${a.rate || '—'} • Рейтинг: ${a.rating||5}`]
+  ]);
+
+  const pills = byId('assistantDatesPills');
+  const dates = Array.isArray(a.availability_dates) ? a.availability_dates : [];
+  pills.textContent = '';
+  if (dates.length){
+    pills.style.display='flex';
+    pills.append(...dates.map(d => el('span', 'miniPill', d)));
+  } else {
+    pills.style.display='none';
+  }
+}
+
+function applyAssistant(a, showUI){
+  fillForm(ASSISTANT_FIELDS, a);
+
+  selectedDates = Array.isArray(a.availability_dates) ? a.availability_dates.slice() : [];
+  selectedDates.sort();
+  renderDates();
+
+  if (showUI) showAssistantDash(a);
+}
+
+// the profile only changes through saveAssistant/saveEmployer, which keep
+// assistantLoaded/employerLoaded current, so tab switches reuse them
+async function loadAssistant(showUI){
+  if (!tgUserId && !username){
+    if (showUI) openAssistantForm();
+    return;
+  }
+  if (assistantLoaded){
+    applyAssistant(assistantLoaded, showUI);
+    return;
+  }
+  try{
+    const r = await fetch('/api/assistant?' + profileQs);
+    const data = await r.json();
+    if (!data.assistant){
+      assistantLoaded = null;
+      if (showUI) openAssistantForm();
+      return;
+    }
+    applyAssistant(data.assistant, showUI);
+  }catch(e){
+    assistantLoaded = null;
+    if (showUI) openAssistantForm();
+  }
+}
+
+async function saveAssistant(){
+  const form = readForm(ASSISTANT_FIELDS);
+  const payload = {
+    tg_user_id: tgUserId,
+    tg_username: username,
+    ...form,
+    rate: form.rate || null,
+    availability_dates: selectedDates
+  };
+
+  if (!payload.name || !payload.city || !payload.phone){
+    showNote('a_err', 'Заполните: имя, город, телефон.');
+    return;
+  }
+
+  try{
+    const r = await fetch('/api/assistant', {method:'POST', body: formBody(payload)});
+    const data = await r.json();
+    if (!r.ok){
+      showNote('a_err', errText(data, 'Ошибка.'));
+      return;
+    }
+    showNote('a_ok', '✅ Сохранено');
+    showAssistantDash(data.assistant);
+  }catch(e){
+    showNote('a_err', 'Сервер недоступен.');
+  }
+}
+
+function cancelAssistant(){
+  if (assistantLoaded) showAssistantDash(assistantLoaded);
+  else goRoleChoice();
+}
+
+// -------- Employer --------
+function openEmployerForm(){
+  hideAll();
+  byId('employerForm').style.display='block';
+}
+
+function showEmployerDash(e){
+  employerLoaded = e;
+  hideAll();
+  byId('employerDash').style.display='block';
+  byId('listWrap').style.display='none';
+  byId('list').textContent='';
+  renderQueue = [];
+  // a search still in flight would re-show #listWrap with the old query's results
+  searchCtl?.abort();
+
+  if (sameFields(employerRendered, e, ['clinic', 'city', 'phone', 'about'])) return;
+  employerRendered = e;
+
+  setLines(byId('employerSummary'), [
+    [el('b', null, e.clinic), ` • ${e.city}`],
+    [`Телефон: ${e.phone}`],
+    e.about ? [`Комментарий: ${e.about}`] : null
+  ].filter(Boolean));
+}
+
+async function loadEmployer(showUI){
+  if (!tgUserId && !username){
+    if (showUI) openEmployerForm();
+    return;
+  }
+  if (employerLoaded){
+    fillForm(EMPLOYER_FIELDS, employerLoaded);
+    if (showUI) showEmployerDash(employerLoaded);
+    return;
+  }
+  try{
+    const r = await fetch('/api/employer?' + profileQs);
+    const data = await r.json();
+    if (!data.employer){
+      employerLoaded = null;
+      if (showUI) openEmployerForm();
+      return;
+    }
+    const e = data.employer;
+    fillForm(EMPLOYER_FIELDS, e);
+    if (showUI) showEmployerDash(e);
+  }catch(e){
+    employerLoaded = null;
+    if (showUI) openEmployerForm();
+  }
+}
+
+async function saveEmployer(){
+  const payload = {
+    tg_user_id: tgUserId,
+    tg_username: username,
+    ...readForm(EMPLOYER_FIELDS)
+  };
+
+  if (!payload.clinic || !payload.city || !payload.phone){
+    showNote('e_err2', 'Заполните: клиника/имя, город, телефон.');
+    return;
+  }
+
+  try{
+    const r = await fetch('/api/employer', {method:'POST', body: formBody(payload)});
+    const data = await r.json();
+    if (!r.ok){
+      showNote('e_err2', errText(data, 'Ошибка.'));
+      return;
+    }
+    showNote('e_ok', '✅ Сохранено');
+    showEmployerDash(data.employer);
+  }catch(e){
+    showNote('e_err2', 'Сервер недоступен.');
+  }
+}
+
+function cancelEmployer(){
+  if (employerLoaded) showEmployerDash(employerLoaded);
+  else goRoleChoice();
+}
+
+// the same usernames show up across rows and repeat searches
+const tgLinkCache = new Map();
+
+function tgLink(u){
+  if (!u) return null;
+  let link = tgLinkCache.get(u);
+  if (link === undefined){
+    link = 'https://t.me/' + encodeURIComponent(u.replace(/^@/, ''));
+    if (tgLinkCache.size >= 512) tgLinkCache.clear();
+    tgLinkCache.set(u, link);
+  }
+  return link;
+}
+
+function assistantRow(a){
+  const link = tgLink(a.tg_username);
+  const meta = [a.city, `опыт: ${a.exp}`, a.rate ? `ставка: ${a.rate}` : null].filter(Boolean).join(' • ');
+  const dates = Array.isArray(a.availability_dates) ? a.availability_dates : [];
+  const datesLine = dates.length ? ('Даты: ' + dates.join(', ')) : 'Даты: —';
+  const about = (a.about || '').slice(0, 160);
+
+  let right;
+  if (link){
+    right = el('a', 'linkBtn', 'Написать');
+    right.target = '_blank';
+    right.href = link;
+  } else {
+    right = el('span', 'pill', 'нет username');
+  }
+
+  const item = tplAssistantItem.cloneNode(true);
+  item.querySelector('.itemName').textContent = a.name || 'Ассистент';
+  item.querySelector('.itemMeta').textContent = meta;
+  item.querySelector('.itemRight').appendChild(right);
+  item.querySelector('.itemDates').textContent = datesLine;
+  item.querySelector('.itemAbout').textContent = about;
+  item.querySelector('.itemRating').textContent = 'Рейтинг: ' + String(a.rating||5);
+  return item;
+}
+
+// iOS WebViews have no requestIdleCallback
+const onIdle = window.requestIdleCallback || (cb => setTimeout(() => cb({timeRemaining: () => 8}), 1));
+const RENDER_CHUNK = 50;
+// rows waiting to be appended to #list, drained in idle slices
+let renderQueue = [];
+let renderScheduled = false;
+
+function pumpAssistants(deadline){
+  const box = byId('list');
+  do {
+    const frag = document.createDocumentFragment();
+    for (const a of renderQueue.splice(0, RENDER_CHUNK)) frag.appendChild(assistantRow(a));
+    box.appendChild(frag);
+  } while (renderQueue.length && deadline.timeRemaining() > 4);
+  scheduleAssistants();
+}
+
+function scheduleAssistants(){
+  if (renderScheduled || !renderQueue.length) return;
+  renderScheduled = true;
+  onIdle(deadline => { renderScheduled = false; pumpAssistants(deadline); });
+}
+
+function renderAssistants(list){
+  const wrap = byId('listWrap');
+  const box = byId('list');
+  wrap.style.display = 'block';
+
+  box.textContent = '';
+  renderQueue = Array.isArray(list) ? list.slice() : [];
+  if (!renderQueue.length){
+    box.appendChild(el('div', 'item', 'Ничего не найдено.'));
+    return;
+  }
+  // first chunk right away, the rest in idle slices so input/scroll stay responsive
+  pumpAssistants({timeRemaining: () => 0});
+}
+
+function appendAssistants(items){
+  renderQueue.push(...items);
+  scheduleAssistants();
+}
+
+// query string -> {text, list}; render from here first, then revalidate
+const searchCache = new Map();
+const SEARCH_CACHE_MAX = 50;
+// only the latest search may render; older in-flight requests get aborted
+let searchCtl = null;
+
+async function searchAssistants(){
+  const city = employerLoaded?.city || byId('e_city').value;
+  if (!city){
+    showNote('e_err', 'Сначала заполните профиль работодателя.');
+    return;
+  }
+
+  const date = byId('e_filter_date').value;
+  const expMin = byId('e_filter_exp').value;
+  const rateMax = byId('e_filter_rate').value;
+
+  let key = 'city=' + encodeURIComponent(city);
+  if (date) key += '&date=' + encodeURIComponent(date);
+  if (expMin) key += '&exp_min=' + encodeURIComponent(expMin.replace('+',''));
+  if (rateMax) key += '&rate_max=' + encodeURIComponent(rateMax);
+
+  searchCtl?.abort();
+  const ctl = searchCtl = new AbortController();
+
+  const cached = searchCache.get(key);
+  if (cached) renderAssistants(cached.list);
+
+  try{
+    // pages arrive one cursor at a time; without a cached copy on screen,
+    // render each page as it lands so rendering overlaps the next fetch
+    // the server returns identical bytes for identical pages, so the raw bodies
+    // double as the change check and the list is never re-serialized
+    const list = [];
+    const bodies = [];
+    let after = null;
+    do {
+      const url = '/api/assistants?' + key + (after != null ? '&after=' + after : '');
+      const r = await fetch(url, {signal: ctl.signal});
+      const body = await r.text();
+      bodies.push(body);
+      const data = JSON.parse(body);
+      const items = Array.isArray(data.items) ? data.items : [];
+      if (!cached){
+        if (list.length) appendAssistants(items);
+        else renderAssistants(items);
+      }
+      list.push(...items);
+      after = data.next;
+    } while (after != null);
+
+    const text = bodies.join('\n');
+    if (cached && cached.text === text) return;
+    searchCache.delete(key);
+    searchCache.set(key, {text, list});
+    if (searchCache.size > SEARCH_CACHE_MAX) searchCache.delete(searchCache.keys().next().value);
+    if (cached) renderAssistants(list);
+  }catch(e){
+    if (e.name === 'AbortError') return;
+    if (!cached) showNote('e_err', 'Ошибка загрузки.');
+  }
+}
+
+// filter edits come in bursts (typing a rate); only the last one hits the API
+const searchAssistantsDebounced = debounce(searchAssistants, 300);
+
+// -------- Admin --------
+let adminCtl = null;
+
+async function adminLoadAll(){
+  adminCtl?.abort();
+  const ctl = adminCtl = new AbortController();
+  try{
+    const r = await fetch('/api/admin/bundle?' + adminQs, {signal: ctl.signal});
+    const data = await r.json();
+    if (!r.ok){
+      byId('adminSummary').innerText = 'Нет доступа';
+      return;
+    }
+    adminData = data;
+    setLines(byId('adminSummary'), [
+      ['Ассистенты: ', el('b', null, String(data.summary.assistants))],
+      ['Работодатели: ', el('b', null, String(data.summary.employers))]
+    ]);
+    adminRender();
+  }catch(e){
+    if (e.name === 'AbortError') return;
+    showNote('adminErr', 'Ошибка');
+  }
+}
+
+function adminRender(){
+  if (!adminData || !adminKind) return;
+  renderAdminList(adminKind, (adminKind === 'assistant' ? adminData.assistants : adminData.employers) || []);
+}
+
+function adminLoadAssistants(){
+  adminKind = 'assistant';
+  adminRender();
+}
+
+function adminLoadEmployers(){
+  adminKind = 'employer';
+  adminRender();
+}
+
+function renderAdminList(kind, items){
+  const box = byId('adminList');
+  box.textContent = '';
+  if (!items.length){
+    box.appendChild(el('div', 'item', 'Пусто'));
+    return;
+  }
+  const frag = document.createDocumentFragment();
+  for (const x of items){
+    const title = kind === 'assistant'
+      ? `${x.name} • ${x.city}`
+      : `${x.clinic} • ${x.city}`;
+
+    const sub = `Тел: ${x.phone} • tg: ${x.tg_username||'—'} • id: ${x.id}`;
+
+    const item = tplAdminItem.cloneNode(true);
+    item.querySelector('.itemName').textContent = title;
+    item.querySelector('.itemMeta').textContent = sub;
+    item.querySelector('.itemCreated').textContent = String(x.created_at||'');
+    const del = item.querySelector('.itemDel');
+    del.dataset.kind = kind;
+    del.dataset.id = String(x.id);
+    frag.appendChild(item);
+  }
+  box.appendChild(frag);
+}
+
+// one listener for every row's delete link
+byId('adminList').addEventListener('click', ev => {
+  const btn = ev.target.closest('[data-action="del"]');
+  if (!btn) return;
+  ev.preventDefault();
+  adminDelete(btn.dataset.kind, Number(btn.dataset.id));
+});
+
+async function adminDelete(kind, id){
+  if (!confirm('Удалить?')) return;
+  try{
+    const qs = 'kind=' + encodeURIComponent(kind) + '&item_id=' + encodeURIComponent(id) + '&' + adminQs;
+    const r = await fetch('/api/admin/delete?' + qs, {method:'POST'});
+    const data = await r.json();
+    if (!r.ok){ showNote('adminErr', errText(data, 'Ошибка')); return; }
+    adminLoadAll();
+  }catch(e){
+    showNote('adminErr', 'Ошибка');
+  }
+}
+
+// -------- Init --------
+(function init(){
+  if (tg){
+    tg.ready();
+    const u = tg.initDataUnsafe?.user;
+    tgUserId = u?.id || null;
+    username = u?.username ? ('@' + u.username) : null;
+
+    byId('tgBadge').innerText =
+      username ? ('@' + username.replace('@','')) : 'без username';
+
+    if (tgUserId === 810418985){
+      byId('tabAdmin').style.display = 'inline-block';
+    }
+  } else {
+    byId('tgBadge').innerText = 'не Telegram';
+    byId('tabAdmin').style.display = 'none';
+  }
+
+  const pq = [];
+  if (tgUserId) pq.push('tg_user_id=' + encodeURIComponent(tgUserId));
+  if (username) pq.push('tg_username=' + encodeURIComponent(username));
+  profileQs = pq.join('&');
+  adminQs = 'tg_user_id=' + encodeURIComponent(tgUserId||0);
+
+  const role = storedRole = localStorage.getItem('role');
+  if (!role){
+    goRoleChoice();
+    return;
+  }
+  setRole(role);
+})();